@@ -1,17 +1,30 @@
 # Complete app.py - Misinformation Detection API with Phase 1 Enhancements
 # Copy this entire file to replace your existing app.py
 
-from flask import Flask, request, jsonify
+from flask import Flask, Request, request, jsonify
 from flask_cors import CORS
+from flask_compress import Compress
 from werkzeug.utils import secure_filename
+from werkzeug.formparser import FormDataParser, MultiPartParser
 import os
+import io
+import mmap
+import shutil
 import logging
 import traceback
+import hmac
+import hashlib
+from pathlib import Path
+from tempfile import SpooledTemporaryFile
+from uuid import uuid4
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from utils.cache import ONE_DAY, ContentCache, content_hash
+from utils.validation import TextRequest, UrlRequest, validate
 
 # Import your custom modules
 try:
-    from utils.sources import check_source_credibility
+    from utils.sources import check_source_credibility, clear_credibility_cache
     from utils.web_scraper import WebScraper
     from utils.fact_checker import FactCheckAPI
     from utils.news_verifier import NewsVerifier
@@ -25,10 +38,42 @@ except ImportError as e:
 # Load environment variables
 load_dotenv()
 
+class LargeBufferFormDataParser(FormDataParser):
+    """Multipart parser that reads uploads in 1MB chunks instead of Werkzeug's 64KB"""
+    buffer_size = 1 << 20
+    
+    def _parse_multipart(self, stream, mimetype, content_length, options):
+        # Same as FormDataParser._parse_multipart, plus buffer_size
+        parser = MultiPartParser(
+            stream_factory=self.stream_factory,
+            max_form_memory_size=self.max_form_memory_size,
+            max_form_parts=self.max_form_parts,
+            cls=self.cls,
+            buffer_size=self.buffer_size
+        )
+        boundary = options.get('boundary', '').encode('ascii')
+        
+        if not boundary:
+            raise ValueError('Missing boundary')
+        
+        form, files = parser.parse(stream, boundary, content_length)
+        return stream, form, files
+
+class UploadRequest(Request):
+    form_data_parser_class = LargeBufferFormDataParser
+
 # Initialize Flask application
 app = Flask(__name__)
+app.request_class = UploadRequest
 CORS(app)
 
+# Use orjson for response serialization when installed (much faster on large transcripts)
+try:
+    from utils.json_provider import ORJSONProvider
+    app.json = ORJSONProvider(app)
+except ImportError:
+    print("Warning: orjson not installed - using the standard JSON provider")
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -41,8 +86,16 @@ app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 100 * 1024 * 1024  # 100MB max file size
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your-secret-key-change-this')
 
-# Ensure upload directory exists
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+# Response compression - transcripts and fact-check citations compress very well
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 1024  # Small responses are not worth the CPU
+app.config['COMPRESS_BR_LEVEL'] = 4  # Best latency/ratio trade-off for on-the-fly brotli
+app.config['COMPRESS_LEVEL'] = 4
+Compress(app)
+
+# Ensure upload directory exists (resolved once; endpoints join onto this Path)
+UPLOAD_DIR = Path(app.config['UPLOAD_FOLDER']).resolve()
+UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 # Initialize all processors with error handling
 processors_status = {}
@@ -50,71 +103,150 @@ processors_status = {}
 try:
     web_scraper = WebScraper()
     processors_status['web_scraper'] = True
-    logger.info("✅ WebScraper initialized")
+    logger.info("WebScraper initialized")
 except Exception as e:
     web_scraper = None
     processors_status['web_scraper'] = False
-    logger.error(f"❌ WebScraper failed: {e}")
+    logger.error("WebScraper failed: %s", e)
 
 try:
     text_analyzer = TextAnalyzer()
     processors_status['text_analyzer'] = True
-    logger.info("✅ TextAnalyzer initialized")
+    logger.info("TextAnalyzer initialized")
 except Exception as e:
     text_analyzer = None
     processors_status['text_analyzer'] = False
-    logger.error(f"❌ TextAnalyzer failed: {e}")
+    logger.error("TextAnalyzer failed: %s", e)
 
 try:
     fact_checker = FactCheckAPI()
     processors_status['fact_checker'] = True
-    logger.info("✅ FactCheckAPI initialized")
+    logger.info("FactCheckAPI initialized")
 except Exception as e:
     fact_checker = None
     processors_status['fact_checker'] = False
-    logger.error(f"❌ FactCheckAPI failed: {e}")
+    logger.error("FactCheckAPI failed: %s", e)
 
 try:
     news_verifier = NewsVerifier()
     processors_status['news_verifier'] = True
-    logger.info("✅ NewsVerifier initialized")
+    logger.info("NewsVerifier initialized")
 except Exception as e:
     news_verifier = None
     processors_status['news_verifier'] = False
-    logger.error(f"❌ NewsVerifier failed: {e}")
+    logger.error("NewsVerifier failed: %s", e)
 
-try:
-    video_processor = VideoProcessor(model_size="base")
-    processors_status['video_processor'] = True
-    logger.info("✅ VideoProcessor initialized")
-except Exception as e:
-    video_processor = None
-    processors_status['video_processor'] = False
-    logger.error(f"❌ VideoProcessor failed: {e}")
+# Web nodes that only queue video/image jobs (see tasks.py) can skip loading
+# Whisper/TrOCR with LOAD_MEDIA_MODELS=0; Celery workers keep the default
+video_processor = None
+image_processor = None
+processors_status['video_processor'] = False
+processors_status['image_processor'] = False
 
-try:
-    image_processor = ImageProcessor()
-    processors_status['image_processor'] = True
-    logger.info("✅ ImageProcessor initialized")
-except Exception as e:
-    image_processor = None
-    processors_status['image_processor'] = False
-    logger.error(f"❌ ImageProcessor failed: {e}")
+if os.getenv('LOAD_MEDIA_MODELS', '1') == '1':
+    try:
+        video_processor = VideoProcessor(model_size="base")
+        processors_status['video_processor'] = True
+        logger.info("VideoProcessor initialized")
+    except Exception as e:
+        logger.error("VideoProcessor failed: %s", e)
+    
+    try:
+        image_processor = ImageProcessor()
+        processors_status['image_processor'] = True
+        logger.info("ImageProcessor initialized")
+    except Exception as e:
+        logger.error("ImageProcessor failed: %s", e)
+else:
+    logger.info("Skipping Whisper/TrOCR (LOAD_MEDIA_MODELS=0)")
+
+def warmup_processors():
+    """Run a dummy inference through each model so the first request is not a cold start"""
+    for processor in (video_processor, image_processor):
+        if processor and hasattr(processor, 'warmup'):
+            processor.warmup()
+
+# Warm up only in processes that serve requests: the reloader child under
+# `python app.py`, or under gunicorn (WARMUP_MODELS=1) whichever process loads the
+# models - the master when preloading on CPU, each worker after fork on CUDA hosts
+if os.environ.get('WERKZEUG_RUN_MAIN') or os.environ.get('WARMUP_MODELS') == '1':
+    warmup_processors()
+
+# Optional background job queue for long video/image analyses (see tasks.py)
+celery_app = None
+if os.getenv('CELERY_BROKER_URL'):
+    try:
+        from tasks import celery_app, analyze_video_task, analyze_image_task
+        logger.info("Celery job queue enabled")
+    except ImportError as e:
+        logger.error("Celery job queue unavailable: %s", e)
+
+# Analysis results keyed by content hash - identical input skips model and API work.
+# TTL matches the shortest sub-cache (NewsVerifier) so news results never outlive it.
+analysis_cache = ContentCache(maxsize=10_000, ttl=ONE_DAY)
+
+# Shared pool for outbound fact-check / news API calls (I/O bound, so threads are enough)
+enhancement_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('ENHANCEMENT_WORKERS', '16')),
+    thread_name_prefix='enhancement'
+)
 
 # Supported file formats
 ALLOWED_VIDEO_EXTENSIONS = {'mp4', 'avi', 'mov', 'wmv', 'flv', 'mkv', 'webm'}
 ALLOWED_IMAGE_EXTENSIONS = {'jpg', 'jpeg', 'png', 'bmp', 'tiff', 'webp', 'gif'}
 
 # Utility Functions
+def _parse_upload(filename, allowed):
+    """Return (extension, is_allowed) from a single scan of the filename"""
+    dot = filename.rfind('.')
+    ext = filename[dot + 1:].lower() if dot >= 0 else ''
+    return ext, ext in allowed
+
 def allowed_video_file(filename):
     """Check if uploaded file is a supported video format"""
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in ALLOWED_VIDEO_EXTENSIONS
+    return _parse_upload(filename, ALLOWED_VIDEO_EXTENSIONS)[1]
 
 def allowed_image_file(filename):
     """Check if uploaded file is a supported image format"""
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in ALLOWED_IMAGE_EXTENSIONS
+    return _parse_upload(filename, ALLOWED_IMAGE_EXTENSIONS)[1]
+
+def _upload_fileno(stream):
+    """File descriptor backing an upload stream, or None if it is still in memory"""
+    # Werkzeug spools each file part in a SpooledTemporaryFile (500KB in memory);
+    # fileno() on one that hasn't rolled over would force a rollover to disk first
+    if isinstance(stream, SpooledTemporaryFile) and not stream._rolled:
+        return None
+    try:
+        return stream.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None  # BytesIO or another in-memory stream
+
+def _save_upload(file_storage, path):
+    """Write an uploaded file to disk, zero-copy when Werkzeug spooled it to a temp file"""
+    stream = file_storage.stream
+    src_fd = _upload_fileno(stream)
+    
+    if src_fd is not None and hasattr(os, 'sendfile'):
+        start = stream.tell()
+        offset = start
+        remaining = os.fstat(src_fd).st_size - offset
+        dst_fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            while remaining > 0:
+                sent = os.sendfile(dst_fd, src_fd, offset, remaining)
+                if sent == 0:
+                    break
+                offset += sent
+                remaining -= sent
+            return
+        except OSError as e:
+            logger.warning("sendfile failed, falling back to buffered copy: %s", e)
+            stream.seek(start)
+        finally:
+            os.close(dst_fd)
+    
+    with open(path, 'wb') as f:
+        shutil.copyfileobj(stream, f, length=1 << 20)
 
 def generate_recommendations(credibility_score, source_credibility=None, has_fact_check=False, has_news_verification=False):
     """Generate enhanced user recommendations based on all analysis results"""
@@ -160,11 +292,74 @@ def generate_recommendations(credibility_score, source_credibility=None, has_fac
     
     return recommendations
 
+def enrich(analysis, text, input_type='text'):
+    """Integrate fact-checking and news verification into an analysis result
+    Both external lookups run concurrently; returns (analysis, enhanced_features)"""
+    # Independent network calls - start both before waiting on either
+    fact_check_future = enhancement_executor.submit(fact_checker.check_claims_with_google, text) if fact_checker else None
+    news_future = enhancement_executor.submit(news_verifier.verify_news_claims, text) if news_verifier else None
+    enhanced_features = {'fact_checking': False, 'news_verification': False}
+    
+    # Enhanced fact-checking (if available)
+    if fact_check_future:
+        try:
+            logger.info("Running fact-check analysis...")
+            analysis = fact_checker.integrate_with_analysis(analysis, fact_check_future.result())
+            enhanced_features['fact_checking'] = True
+            logger.info("Fact-check analysis completed")
+        except Exception as e:
+            logger.error("Fact checking failed for %s: %s", input_type, e)
+            analysis['fact_check_status'] = 'failed'
+    
+    # News verification (if available)
+    if news_future:
+        try:
+            logger.info("Running news verification...")
+            analysis = news_verifier.integrate_with_analysis(analysis, news_future.result())
+            enhanced_features['news_verification'] = True
+            logger.info("News verification completed")
+        except Exception as e:
+            logger.error("News verification failed for %s: %s", input_type, e)
+            analysis['news_verification'] = 'failed'
+    
+    return analysis, enhanced_features
+
+def _cached_analyze(input_type, text, source_score=5, tokens=None):
+    """Run text analysis plus enrich(), cached by content hash"""
+    cache_key = content_hash(input_type, source_score, text)
+    cached = analysis_cache.get(cache_key)
+    if cached is not None:
+        logger.info("Cache hit for %s analysis", input_type)
+        # Shallow copy so per-request fields never leak back into the cache
+        return dict(cached['analysis']), dict(cached['enhanced_features'])
+    
+    analysis_result = text_analyzer.analyze_text(text, source_score=source_score, tokens=tokens)
+    analysis_result, enhanced_features = enrich(analysis_result, text, input_type=input_type)
+    
+    # Don't pin a degraded result - the next identical request should retry the lookups
+    if not _enrichment_failed(analysis_result):
+        analysis_cache.set(cache_key, {'analysis': analysis_result, 'enhanced_features': enhanced_features})
+    return dict(analysis_result), dict(enhanced_features)
+
+def _enrichment_failed(analysis):
+    """True if a fact-check or news lookup hit a transient failure worth retrying"""
+    fact_check_status = analysis.get('fact_check_status')
+    news_status = analysis.get('news_verification')
+    if 'failed' in (fact_check_status, news_status):
+        return True
+    # 'unavailable' also means "no API key" - permanent, so only a configured API's error counts
+    return ((fact_check_status == 'unavailable' and bool(fact_checker and fact_checker.google_api_key))
+            or (news_status == 'unavailable' and bool(news_verifier and news_verifier.api_key)))
+
+def _short_digest(value):
+    """4-hex-char digest that is stable across processes (unlike hash())"""
+    return hashlib.blake2b(value.encode('utf-8', 'replace'), digest_size=2).hexdigest()
+
 def handle_error(error, error_type="Processing"):
     """Standardized error handling with logging"""
-    error_id = f"{error_type}_{hash(str(error)) % 10000}"
-    logger.error(f"Error {error_id}: {str(error)}")
-    logger.error(f"Traceback: {traceback.format_exc()}")
+    error_id = f"{error_type}_{_short_digest(repr(error))}"
+    logger.error("Error %s: %s", error_id, error)
+    logger.error("Traceback: %s", traceback.format_exc())
     
     return jsonify({
         'error': f'{error_type} error occurred',
@@ -193,7 +388,8 @@ def home():
             "/analyze/text": "Analyze text content (POST)",
             "/analyze/url": "Analyze webpage URL (POST)", 
             "/analyze/video": "Analyze video transcript (POST)",
-            "/analyze/image": "Analyze image text (POST)"
+            "/analyze/image": "Analyze image text (POST)",
+            "/jobs/<job_id>": "Poll a queued video/image analysis (GET)"
         },
         "status": "running"
     })
@@ -221,22 +417,12 @@ def health_check():
         "max_file_size": f"{app.config['MAX_CONTENT_LENGTH'] // (1024*1024)}MB"
     })
 
-@app.route('/analyze/text', methods=['POST'])
-def analyze_text():
+@validate(TextRequest, example={'text': 'Your content to analyze here'})
+def analyze_text(payload):
     """Enhanced text analysis with fact-checking and news verification"""
     try:
-        if not text_analyzer:
-            return jsonify({'error': 'Text analyzer not available. Check server configuration.'}), 500
-        
-        # Get and validate input
-        data = request.get_json()
-        if not data or 'text' not in data:
-            return jsonify({
-                'error': 'Missing required field: text',
-                'example': {'text': 'Your content to analyze here'}
-            }), 400
-        
-        text_content = data['text'].strip()
+        # Validate input
+        text_content = payload.text.strip()
         if not text_content:
             return jsonify({'error': 'Text content cannot be empty'}), 400
         if len(text_content) < 10:
@@ -244,42 +430,19 @@ def analyze_text():
         if len(text_content) > 10000:
             return jsonify({'error': 'Text too long. Maximum 10,000 characters allowed.'}), 400
         
-        logger.info(f"🔍 Analyzing text content: {len(text_content)} characters")
-        
-        # Step 1: Basic text analysis
-        analysis_result = text_analyzer.analyze_text(text_content)
-        
-        # Step 2: Enhanced fact-checking (if available)
-        fact_check_enhanced = False
-        if fact_checker:
-            try:
-                logger.info("🔍 Running fact-check analysis...")
-                fact_check_data = fact_checker.check_claims_with_google(text_content)
-                analysis_result = fact_checker.integrate_with_analysis(analysis_result, fact_check_data)
-                fact_check_enhanced = True
-                logger.info("✅ Fact-check analysis completed")
-            except Exception as e:
-                logger.error(f"⚠️ Fact checking failed: {e}")
-                analysis_result['fact_check_status'] = 'failed'
-        
-        # Step 3: News verification (if available)
-        news_verification_enhanced = False
-        if news_verifier:
-            try:
-                logger.info("📰 Running news verification...")
-                news_data = news_verifier.verify_news_claims(text_content)
-                analysis_result = news_verifier.integrate_with_analysis(analysis_result, news_data)
-                news_verification_enhanced = True
-                logger.info("✅ News verification completed")
-            except Exception as e:
-                logger.error(f"⚠️ News verification failed: {e}")
-                analysis_result['news_verification'] = 'failed'
+        logger.info("Analyzing text content: %d characters", len(text_content))
+        
+        # Tokenize once and reuse for the analyzer and the response
+        tokens = text_content.split()
+        
+        # Steps 1-3: Text analysis, fact-checking and news verification
+        analysis_result, enhanced_features = _cached_analyze('text', text_content, tokens=tokens)
         
         # Step 4: Generate enhanced recommendations
         recommendations = generate_recommendations(
             analysis_result['credibility_score'],
-            has_fact_check=fact_check_enhanced,
-            has_news_verification=news_verification_enhanced
+            has_fact_check=enhanced_features['fact_checking'],
+            has_news_verification=enhanced_features['news_verification']
         )
         analysis_result['recommendations'] = recommendations
         
@@ -289,13 +452,12 @@ def analyze_text():
             'analysis': analysis_result,
             'input_type': 'text',
             'enhanced_features': {
-                'fact_checking': fact_check_enhanced,
-                'news_verification': news_verification_enhanced,
+                **enhanced_features,
                 'advanced_pattern_detection': True
             },
             'processing_info': {
                 'text_length': len(text_content),
-                'word_count': len(text_content.split()),
+                'word_count': len(tokens),
                 'processing_time': 'real-time'
             }
         })
@@ -303,32 +465,22 @@ def analyze_text():
     except Exception as e:
         return handle_error(e, "Enhanced Text Analysis")
 
-@app.route('/analyze/url', methods=['POST'])
-def analyze_url():
+@validate(UrlRequest, example={'url': 'https://example.com/article'})
+def analyze_url(payload):
     """Enhanced URL analysis with source checking and content verification"""
     try:
-        if not web_scraper or not text_analyzer:
-            return jsonify({'error': 'URL analyzer not available. Check server configuration.'}), 500
-        
-        # Get and validate input
-        data = request.get_json()
-        if not data or 'url' not in data:
-            return jsonify({
-                'error': 'Missing required field: url',
-                'example': {'url': 'https://example.com/article'}
-            }), 400
-        
-        url = data['url'].strip()
+        # Validate input
+        url = payload.url.strip()
         if not url:
             return jsonify({'error': 'URL cannot be empty'}), 400
         if not (url.startswith('http://') or url.startswith('https://')):
             return jsonify({'error': 'URL must start with http:// or https://'}), 400
         
-        logger.info(f"🌐 Analyzing URL: {url}")
+        logger.info("Analyzing URL: %s", url)
         
         # Step 1: Check source credibility
         source_credibility = check_source_credibility(url)
-        logger.info(f"📊 Source credibility: {source_credibility.get('credibility', 'unknown')}")
+        logger.info("Source credibility: %s", source_credibility.get('credibility', 'unknown'))
         
         # Step 2: Fetch and analyze content
         content_data = web_scraper.fetch_page_content(url)
@@ -351,30 +503,14 @@ def analyze_url():
             }), 400
         
         # Step 3: Analyze extracted content
-        text_content = f"{content_data.get('title', '')} {content_data.get('main_content', '')}".strip()
-        analysis_result = text_analyzer.analyze_text(
-            text_content, 
-            source_score=source_credibility['score']
-        )
-        
+        text_content = content_data['combined_text']
         # Step 4: Enhanced analysis (if available)
-        enhanced_features = {'fact_checking': False, 'news_verification': False}
-        
-        if fact_checker:
-            try:
-                fact_check_data = fact_checker.check_claims_with_google(text_content)
-                analysis_result = fact_checker.integrate_with_analysis(analysis_result, fact_check_data)
-                enhanced_features['fact_checking'] = True
-            except Exception as e:
-                logger.error(f"Fact checking failed for URL: {e}")
-        
-        if news_verifier:
-            try:
-                news_data = news_verifier.verify_news_claims(text_content)
-                analysis_result = news_verifier.integrate_with_analysis(analysis_result, news_data)
-                enhanced_features['news_verification'] = True
-            except Exception as e:
-                logger.error(f"News verification failed for URL: {e}")
+        analysis_result, enhanced_features = _cached_analyze(
+            'url',
+            text_content,
+            source_score=source_credibility['score'],
+            tokens=content_data['tokens']
+        )
         
         # Step 5: Combine all results
         combined_result = {
@@ -409,14 +545,162 @@ def analyze_url():
     except Exception as e:
         return handle_error(e, "Enhanced URL Analysis")
 
-@app.route('/analyze/video', methods=['POST'])
+def run_video_analysis(video_path, original_filename):
+    """Transcribe and analyze a saved video upload; returns (response_body, status_code)
+    The uploaded file is always deleted afterwards, so this can run in a background worker"""
+    try:
+        # Validate video file
+        is_valid, validation_error = video_processor.validate_video_file(video_path)
+        if not is_valid:
+            return {'error': validation_error}, 400
+        
+        # Process video with Whisper
+        logger.info("Starting Whisper transcription...")
+        transcript, processing_error = video_processor.process_video_file(video_path)
+        
+        if processing_error:
+            return {'error': processing_error}, 500
+        
+        if not transcript or len(transcript.strip()) < 10:
+            return {
+                'error': 'No meaningful speech detected in video',
+                'transcript': transcript or '',
+                'suggestions': [
+                    'Ensure video contains clear speech',
+                    'Check audio quality and volume',
+                    'Try a video with longer speech content',
+                    'Verify video has an audio track'
+                ]
+            }, 400
+        
+        logger.info("Transcription successful: %d characters", len(transcript))
+        
+        # Analyze transcript with enhanced analysis (if available)
+        tokens = transcript.split()
+        analysis_result, enhanced_features = _cached_analyze('video', transcript, tokens=tokens)
+        
+        # Generate recommendations
+        recommendations = generate_recommendations(
+            analysis_result['credibility_score'],
+            has_fact_check=enhanced_features['fact_checking'],
+            has_news_verification=enhanced_features['news_verification']
+        )
+        analysis_result['recommendations'] = recommendations
+        
+        return {
+            'success': True,
+            'transcript': transcript,
+            'analysis': analysis_result,
+            'input_type': 'video',
+            'enhanced_features': enhanced_features,
+            'video_info': {
+                'original_filename': original_filename,
+                'transcript_length': len(transcript),
+                'word_count': len(tokens),
+                'model_used': video_processor.get_model_info() if hasattr(video_processor, 'get_model_info') else 'Whisper'
+            }
+        }, 200
+        
+    finally:
+        # Always clean up uploaded file
+        try:
+            Path(video_path).unlink(missing_ok=True)
+            logger.info("Cleaned up video file")
+        except Exception as cleanup_error:
+            logger.warning("Could not clean up file: %s", cleanup_error)
+
+def run_image_analysis(image_path, original_filename):
+    """Extract and analyze text from a saved image upload; returns (response_body, status_code)
+    The uploaded file is always deleted afterwards, so this can run in a background worker"""
+    image_buffer = None
+    
+    try:
+        # Validate image file
+        is_valid, validation_error = image_processor.validate_image_file(image_path)
+        if not is_valid:
+            return {'error': validation_error}, 400
+        
+        # Extract text with TrOCR
+        logger.info("Starting TrOCR text extraction...")
+        # Map the upload once so every OCR attempt decodes from the same cached pages
+        with open(image_path, 'rb') as f:
+            image_buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        extracted_text, processing_error = image_processor.process_image_file(image_buffer)
+        
+        if processing_error:
+            return {'error': processing_error}, 500
+        
+        if not extracted_text or len(extracted_text.strip()) < 5:
+            return {
+                'message': 'No meaningful text found in image',
+                'extracted_text': extracted_text or '',
+                'suggestions': [
+                    'Ensure image contains visible text',
+                    'Check image quality and resolution',
+                    'Try an image with clearer, larger text',
+                    'Ensure text is not too small or blurry'
+                ]
+            }, 200
+        
+        logger.info("Text extraction successful: %d characters", len(extracted_text))
+        
+        # Analyze extracted text with enhanced analysis (if available)
+        tokens = extracted_text.split()
+        analysis_result, enhanced_features = _cached_analyze('image', extracted_text, tokens=tokens)
+        
+        # Generate recommendations
+        recommendations = generate_recommendations(
+            analysis_result['credibility_score'],
+            has_fact_check=enhanced_features['fact_checking'],
+            has_news_verification=enhanced_features['news_verification']
+        )
+        analysis_result['recommendations'] = recommendations
+        
+        return {
+            'success': True,
+            'extracted_text': extracted_text,
+            'analysis': analysis_result,
+            'input_type': 'image',
+            'enhanced_features': enhanced_features,
+            'image_info': {
+                'original_filename': original_filename,
+                'text_length': len(extracted_text),
+                'word_count': len(tokens),
+                'model_used': image_processor.get_model_info() if hasattr(image_processor, 'get_model_info') else 'TrOCR'
+            }
+        }, 200
+        
+    finally:
+        # Always clean up uploaded file
+        try:
+            if image_buffer is not None:
+                image_buffer.close()
+            Path(image_path).unlink(missing_ok=True)
+            logger.info("Cleaned up image file")
+        except Exception as cleanup_error:
+            logger.warning("Could not clean up file: %s", cleanup_error)
+
+def _enqueue_job(task, upload_path, original_filename):
+    """Queue an analysis task for a saved upload and return the 202 job response"""
+    try:
+        job = task.delay(upload_path, original_filename)
+    except Exception:
+        # Broker unreachable - the worker will never clean this file up
+        Path(upload_path).unlink(missing_ok=True)
+        raise
+    
+    logger.info("Queued job %s", job.id)
+    return jsonify({
+        'success': True,
+        'job_id': job.id,
+        'status': 'queued',
+        'status_url': f"/jobs/{job.id}"
+    }), 202
+
 def analyze_video():
     """Enhanced video analysis with Whisper transcription"""
     try:
-        if not video_processor or not text_analyzer:
-            return jsonify({'error': 'Video processor not available. Check server configuration.'}), 500
-        
-        logger.info("🎥 Video analysis request received")
+        logger.info("Video analysis request received")
         
         # Validate file upload
         if 'video' not in request.files:
@@ -429,113 +713,38 @@ def analyze_video():
         if file.filename == '':
             return jsonify({'error': 'No video file selected'}), 400
         
-        if not allowed_video_file(file.filename):
+        ext, is_allowed = _parse_upload(file.filename, ALLOWED_VIDEO_EXTENSIONS)
+        if not is_allowed:
             return jsonify({
                 'error': 'Invalid video format',
                 'supported_formats': list(ALLOWED_VIDEO_EXTENSIONS),
-                'received_format': file.filename.split('.')[-1] if '.' in file.filename else 'unknown'
+                'received_format': ext or 'unknown'
             }), 400
         
         # Save and validate file
         filename = secure_filename(file.filename)
         if not filename:
-            filename = f"video_{hash(file.filename) % 10000}.mp4"
+            filename = f"video_{_short_digest(file.filename)}.mp4"
         
-        temp_video_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        logger.info(f"💾 Saving video: {filename}")
-        file.save(temp_video_path)
+        # Unique per request so concurrent (or queued) uploads with the same name never collide
+        temp_video_path = os.fspath(UPLOAD_DIR / f"{uuid4().hex}_{filename}")
+        logger.info("Saving video: %s", filename)
+        _save_upload(file, temp_video_path)
         
-        try:
-            # Validate video file
-            is_valid, validation_error = video_processor.validate_video_file(temp_video_path)
-            if not is_valid:
-                return jsonify({'error': validation_error}), 400
-            
-            # Process video with Whisper
-            logger.info("🎤 Starting Whisper transcription...")
-            transcript, processing_error = video_processor.process_video_file(temp_video_path)
-            
-            if processing_error:
-                return jsonify({'error': processing_error}), 500
-            
-            if not transcript or len(transcript.strip()) < 10:
-                return jsonify({
-                    'error': 'No meaningful speech detected in video',
-                    'transcript': transcript or '',
-                    'suggestions': [
-                        'Ensure video contains clear speech',
-                        'Check audio quality and volume',
-                        'Try a video with longer speech content',
-                        'Verify video has an audio track'
-                    ]
-                }), 400
-            
-            logger.info(f"✅ Transcription successful: {len(transcript)} characters")
-            
-            # Analyze transcript
-            analysis_result = text_analyzer.analyze_text(transcript)
-            
-            # Enhanced analysis (if available)
-            enhanced_features = {'fact_checking': False, 'news_verification': False}
-            
-            if fact_checker:
-                try:
-                    fact_check_data = fact_checker.check_claims_with_google(transcript)
-                    analysis_result = fact_checker.integrate_with_analysis(analysis_result, fact_check_data)
-                    enhanced_features['fact_checking'] = True
-                except Exception as e:
-                    logger.error(f"Fact checking failed for video: {e}")
-            
-            if news_verifier:
-                try:
-                    news_data = news_verifier.verify_news_claims(transcript)
-                    analysis_result = news_verifier.integrate_with_analysis(analysis_result, news_data)
-                    enhanced_features['news_verification'] = True
-                except Exception as e:
-                    logger.error(f"News verification failed for video: {e}")
-            
-            # Generate recommendations
-            recommendations = generate_recommendations(
-                analysis_result['credibility_score'],
-                has_fact_check=enhanced_features['fact_checking'],
-                has_news_verification=enhanced_features['news_verification']
-            )
-            analysis_result['recommendations'] = recommendations
-            
-            return jsonify({
-                'success': True,
-                'transcript': transcript,
-                'analysis': analysis_result,
-                'input_type': 'video',
-                'enhanced_features': enhanced_features,
-                'video_info': {
-                    'original_filename': file.filename,
-                    'transcript_length': len(transcript),
-                    'word_count': len(transcript.split()),
-                    'model_used': video_processor.get_model_info() if hasattr(video_processor, 'get_model_info') else 'Whisper'
-                }
-            })
-            
-        finally:
-            # Always clean up uploaded file
-            try:
-                if os.path.exists(temp_video_path):
-                    os.unlink(temp_video_path)
-                    logger.info("🧹 Cleaned up video file")
-            except Exception as cleanup_error:
-                logger.warning(f"⚠️ Could not clean up file: {str(cleanup_error)}")
+        # Long transcriptions go to a background worker when a job queue is configured
+        if celery_app:
+            return _enqueue_job(analyze_video_task, temp_video_path, file.filename)
+        
+        body, status = run_video_analysis(temp_video_path, file.filename)
+        return jsonify(body), status
         
     except Exception as e:
         return handle_error(e, "Enhanced Video Analysis")
 
-@app.route('/analyze/image', methods=['POST'])
 def analyze_image():
     """Enhanced image analysis with TrOCR text extraction"""
     try:
-        if not image_processor or not text_analyzer:
-            return jsonify({'error': 'Image processor not available. Check server configuration.'}), 500
-        
-        logger.info("🖼️ Image analysis request received")
+        logger.info("Image analysis request received")
         
         # Validate file upload
         if 'image' not in request.files:
@@ -548,105 +757,81 @@ def analyze_image():
         if file.filename == '':
             return jsonify({'error': 'No image file selected'}), 400
         
-        if not allowed_image_file(file.filename):
+        ext, is_allowed = _parse_upload(file.filename, ALLOWED_IMAGE_EXTENSIONS)
+        if not is_allowed:
             return jsonify({
                 'error': 'Invalid image format',
                 'supported_formats': list(ALLOWED_IMAGE_EXTENSIONS),
-                'received_format': file.filename.split('.')[-1] if '.' in file.filename else 'unknown'
+                'received_format': ext or 'unknown'
             }), 400
         
         # Save and validate file
         filename = secure_filename(file.filename)
         if not filename:
-            filename = f"image_{hash(file.filename) % 10000}.jpg"
+            filename = f"image_{_short_digest(file.filename)}.jpg"
         
-        temp_image_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        logger.info(f"💾 Saving image: {filename}")
-        file.save(temp_image_path)
+        # Unique per request so concurrent (or queued) uploads with the same name never collide
+        temp_image_path = os.fspath(UPLOAD_DIR / f"{uuid4().hex}_{filename}")
+        logger.info("Saving image: %s", filename)
+        _save_upload(file, temp_image_path)
         
-        try:
-            # Validate image file
-            is_valid, validation_error = image_processor.validate_image_file(temp_image_path)
-            if not is_valid:
-                return jsonify({'error': validation_error}), 400
-            
-            # Extract text with TrOCR
-            logger.info("🔤 Starting TrOCR text extraction...")
-            extracted_text, processing_error = image_processor.process_image_file(temp_image_path)
-            
-            if processing_error:
-                return jsonify({'error': processing_error}), 500
-            
-            if not extracted_text or len(extracted_text.strip()) < 5:
-                return jsonify({
-                    'message': 'No meaningful text found in image',
-                    'extracted_text': extracted_text or '',
-                    'suggestions': [
-                        'Ensure image contains visible text',
-                        'Check image quality and resolution',
-                        'Try an image with clearer, larger text',
-                        'Ensure text is not too small or blurry'
-                    ]
-                })
-            
-            logger.info(f"✅ Text extraction successful: {len(extracted_text)} characters")
-            
-            # Analyze extracted text
-            analysis_result = text_analyzer.analyze_text(extracted_text)
-            
-            # Enhanced analysis (if available)
-            enhanced_features = {'fact_checking': False, 'news_verification': False}
-            
-            if fact_checker:
-                try:
-                    fact_check_data = fact_checker.check_claims_with_google(extracted_text)
-                    analysis_result = fact_checker.integrate_with_analysis(analysis_result, fact_check_data)
-                    enhanced_features['fact_checking'] = True
-                except Exception as e:
-                    logger.error(f"Fact checking failed for image: {e}")
-            
-            if news_verifier:
-                try:
-                    news_data = news_verifier.verify_news_claims(extracted_text)
-                    analysis_result = news_verifier.integrate_with_analysis(analysis_result, news_data)
-                    enhanced_features['news_verification'] = True
-                except Exception as e:
-                    logger.error(f"News verification failed for image: {e}")
-            
-            # Generate recommendations
-            recommendations = generate_recommendations(
-                analysis_result['credibility_score'],
-                has_fact_check=enhanced_features['fact_checking'],
-                has_news_verification=enhanced_features['news_verification']
-            )
-            analysis_result['recommendations'] = recommendations
-            
-            return jsonify({
-                'success': True,
-                'extracted_text': extracted_text,
-                'analysis': analysis_result,
-                'input_type': 'image',
-                'enhanced_features': enhanced_features,
-                'image_info': {
-                    'original_filename': file.filename,
-                    'text_length': len(extracted_text),
-                    'word_count': len(extracted_text.split()),
-                    'model_used': image_processor.get_model_info() if hasattr(image_processor, 'get_model_info') else 'TrOCR'
-                }
-            })
-            
-        finally:
-            # Always clean up uploaded file
-            try:
-                if os.path.exists(temp_image_path):
-                    os.unlink(temp_image_path)
-                    logger.info("🧹 Cleaned up image file")
-            except Exception as cleanup_error:
-                logger.warning(f"⚠️ Could not clean up file: {str(cleanup_error)}")
+        # OCR goes to a background worker when a job queue is configured
+        if celery_app:
+            return _enqueue_job(analyze_image_task, temp_image_path, file.filename)
+        
+        body, status = run_image_analysis(temp_image_path, file.filename)
+        return jsonify(body), status
         
     except Exception as e:
         return handle_error(e, "Enhanced Image Analysis")
 
+def _unavailable(message):
+    """View for an endpoint whose processor failed to initialize"""
+    def unavailable_view(*args, **kwargs):
+        response = jsonify({'error': message, 'processors': processors_status})
+        response.headers['Retry-After'] = '300'
+        return response, 503
+    return unavailable_view
+
+# Register analysis routes once, at startup. Endpoints whose processors failed
+# to load get a 503 stub, so healthy endpoints never re-check availability.
+for rule, view, available, unavailable_message in (
+    ('/analyze/text', analyze_text, text_analyzer,
+     'Text analyzer not available. Check server configuration.'),
+    ('/analyze/url', analyze_url, web_scraper and text_analyzer,
+     'URL analyzer not available. Check server configuration.'),
+    # With a job queue the web process only saves and enqueues - workers run the models
+    ('/analyze/video', analyze_video, celery_app or (video_processor and text_analyzer),
+     'Video processor not available. Check server configuration.'),
+    ('/analyze/image', analyze_image, celery_app or (image_processor and text_analyzer),
+     'Image processor not available. Check server configuration.'),
+):
+    app.add_url_rule(
+        rule,
+        endpoint=view.__name__,
+        view_func=view if available else _unavailable(unavailable_message),
+        methods=['POST']
+    )
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Poll a background video/image analysis job"""
+    if not celery_app:
+        return jsonify({'error': 'Background jobs are not enabled on this server'}), 404
+    
+    job = celery_app.AsyncResult(job_id)
+    response = {'job_id': job_id, 'state': job.state}
+    
+    if job.successful():
+        body, status = job.result
+        response['result'] = body
+        response['result_status'] = status
+    elif job.failed():
+        response['error'] = 'Analysis job failed'
+        response['message'] = str(job.result) if app.debug else 'Internal server error'
+    
+    return jsonify(response)
+
 # Error Handlers
 @app.errorhandler(404)
 def not_found(error):
@@ -670,13 +855,35 @@ def internal_server_error(error):
         'message': 'Something went wrong on the server'
     }), 500
 
+# Admin Endpoints
+@app.route('/admin/flush_cache', methods=['POST'])
+def flush_cache():
+    """Clear in-process caches (only the worker handling this request)"""
+    admin_token = os.getenv('ADMIN_TOKEN')
+    provided_token = request.headers.get('X-Admin-Token', '')
+    if not admin_token or not hmac.compare_digest(provided_token, admin_token):
+        return jsonify({'error': 'Forbidden'}), 403
+    
+    clear_credibility_cache()
+    analysis_cache.clear()
+    if fact_checker:
+        fact_checker.cache.clear()
+    if news_verifier:
+        news_verifier.cache.clear()
+    
+    logger.info("Caches flushed by admin request")
+    return jsonify({
+        'success': True,
+        'flushed': ['source_credibility', 'analysis', 'fact_check', 'news_verification']
+    })
+
 # Development and Testing Endpoints
 @app.route('/test', methods=['POST'])
 def test_endpoint():
     """Test endpoint for development"""
     try:
         data = request.get_json()
-        logger.info(f"Test endpoint received: {data}")
+        logger.info("Test endpoint received: %s", data)
         
         return jsonify({
             'message': 'Test successful',
@@ -690,23 +897,23 @@ def test_endpoint():
 
 if __name__ == '__main__':
     # Development server startup
-    logger.info("🚀 Starting Enhanced Misinformation Detection API v2.0.0...")
-    logger.info(f"📁 Upload folder: {app.config['UPLOAD_FOLDER']}")
-    logger.info(f"📊 Max file size: {app.config['MAX_CONTENT_LENGTH'] // (1024*1024)}MB")
-    logger.info(f"🔧 Processors status: {processors_status}")
+    logger.info("Starting Enhanced Misinformation Detection API v2.0.0...")
+    logger.info("Upload folder: %s", app.config['UPLOAD_FOLDER'])
+    logger.info("Max file size: %sMB", app.config['MAX_CONTENT_LENGTH'] // (1024*1024))
+    logger.info("Processors status: %s", processors_status)
     
     # Display API key status
     if os.getenv('GOOGLE_FACT_CHECK_API_KEY'):
-        logger.info("🔑 Google Fact Check API key configured")
+        logger.info("Google Fact Check API key configured")
     else:
-        logger.warning("⚠️ Google Fact Check API key not found")
+        logger.warning("Google Fact Check API key not found")
     
     if os.getenv('NEWSAPI_API_KEY'):
-        logger.info("🔑 NewsAPI key configured")
+        logger.info("NewsAPI key configured")
     else:
-        logger.warning("⚠️ NewsAPI key not found")
+        logger.warning("NewsAPI key not found")
     
-    # Run Flask development server
+    # Run Flask development server (production: gunicorn -c gunicorn.conf.py wsgi:app)
     app.run(
         debug=True,
         host='0.0.0.0',
@@ -0,0 +1,54 @@
+# gunicorn.conf.py
+"""
+Gunicorn configuration for production deployments
+
+Run with: gunicorn -c gunicorn.conf.py wsgi:app
+
+Environment variables:
+- GUNICORN_BIND: address to listen on (default 0.0.0.0:5000)
+- GUNICORN_WORKERS: worker processes (default: number of CPUs)
+- GUNICORN_WORKER_CLASS: gthread (default) or gevent for URL-analysis-heavy
+  deployments where outbound HTTP dominates (requires `pip install gevent`)
+- GUNICORN_THREADS: threads per gthread worker (default 4)
+- GUNICORN_TIMEOUT: worker timeout in seconds (default 300 for long Whisper/TrOCR jobs)
+- OMP_NUM_THREADS / MKL_NUM_THREADS: torch/numpy threads per worker (default 1)
+
+Model loading:
+- CPU-only hosts: preload_app is on, so Whisper/TrOCR load (and warm up) once in
+  the master and forked workers share the weights copy-on-write.
+- CUDA hosts: preload_app is off. A CUDA context cannot survive fork ("Cannot
+  re-initialize CUDA in forked subprocess"), so each worker imports the app and
+  loads its own copy of the models on the GPU after forking.
+"""
+import multiprocessing
+import os
+
+# Every worker is its own process - keep torch/numpy from oversubscribing the CPUs.
+# Must be set before the app (and torch) is imported by preload_app below.
+os.environ.setdefault('OMP_NUM_THREADS', '1')
+os.environ.setdefault('MKL_NUM_THREADS', '1')
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count()))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '300'))
+
+def _cuda_available():
+    """Detect a GPU via NVML so the master never initializes CUDA itself"""
+    os.environ.setdefault('PYTORCH_NVML_BASED_CUDA_CHECK', '1')
+    try:
+        import torch
+    except ImportError:
+        return False
+    return torch.cuda.is_available()
+
+# Preload (load models once in the master) only when there is no GPU - see docstring
+preload_app = not _cuda_available()
+
+# Tells app.py to run its model warmup wherever it is imported: the master when
+# preloading, otherwise each worker after fork
+os.environ.setdefault('WARMUP_MODELS', '1')
+
+accesslog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
@@ -0,0 +1,99 @@
+# models/batching.py
+"""
+Micro-batching scheduler for sharing one model across concurrent requests
+"""
+import queue
+import threading
+import time
+import logging
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+class MicroBatchScheduler:
+    def __init__(self, max_batch_size=8, max_wait=0.05):
+        """
+        Collect items submitted from request threads and run them in batches
+        max_batch_size: most items passed to one run_batch call
+        max_wait: seconds to wait for more items once the first one arrives
+        """
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+    
+    def submit(self, item):
+        """Queue an item and return a Future resolved with its result"""
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((item, future))
+        return future
+    
+    def bucket_key(self, item):
+        """Items with the same key are batched together (override to bucket by size)"""
+        return None
+    
+    def run_batch(self, items):
+        """Run the model on a list of items, returning one result per item"""
+        raise NotImplementedError
+    
+    def _ensure_worker(self):
+        # Started lazily so gunicorn --preload forks before any thread exists
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run,
+                    name=f"{type(self).__name__}-worker",
+                    daemon=True
+                )
+                self._worker.start()
+    
+    def _collect_batch(self):
+        """Block for the first item, then gather more until full or max_wait passes"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        
+        return batch
+    
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            
+            # Group by bucket to keep padding waste low within each model call
+            buckets = {}
+            for item, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    key = self.bucket_key(item)
+                except Exception:
+                    key = None
+                buckets.setdefault(key, []).append((item, future))
+            
+            for entries in buckets.values():
+                items = [item for item, _ in entries]
+                try:
+                    results = list(self.run_batch(items))
+                    if len(results) != len(items):
+                        # A short result list would leave callers blocked on .result() forever
+                        raise RuntimeError(
+                            f"run_batch returned {len(results)} results for {len(items)} items"
+                        )
+                except Exception as e:
+                    logger.error("Batch of %d failed: %s", len(items), e)
+                    for _, future in entries:
+                        future.set_exception(e)
+                    continue
+                
+                for (_, future), result in zip(entries, results):
+                    future.set_result(result)
@@ -7,17 +7,35 @@ from PIL import Image, ImageEnhance, ImageFilter
 import torch
 import os
 import logging
+from models.batching import MicroBatchScheduler
 
 logger = logging.getLogger(__name__)
 
+class BatchedTrOCRScheduler(MicroBatchScheduler):
+    # No bucket_key override: the TrOCR processor resizes every image to the same
+    # fixed input size, so size buckets would only split batches without saving padding
+    
+    def __init__(self, recognize, max_batch_size=8, max_wait=0.05):
+        """Group concurrent OCR calls into a single TrOCR generate() call"""
+        super().__init__(max_batch_size=max_batch_size, max_wait=max_wait)
+        self.recognize = recognize
+    
+    def run_batch(self, images):
+        """Recognize text for a batch of images"""
+        if len(images) > 1:
+            logger.info("Recognizing text in batch of %d images", len(images))
+        return self.recognize(images)
+
 class ImageProcessor:
-    def __init__(self, model_name="microsoft/trocr-base-printed"):
+    def __init__(self, model_name="microsoft/trocr-base-printed", batch_size=8, max_batch_wait=0.05):
         """
         Initialize image processor with TrOCR
         Available models:
         - microsoft/trocr-base-printed (recommended for printed text)
         - microsoft/trocr-base-handwritten (for handwritten text)
         - microsoft/trocr-large-printed (higher accuracy, slower)
+        batch_size / max_batch_wait: concurrent OCR calls arriving within
+        max_batch_wait seconds share one generate() call of up to batch_size images
         """
         self.model_name = model_name
         
@@ -25,6 +43,7 @@ class ImageProcessor:
             # Load TrOCR processor and model
             self.processor = TrOCRProcessor.from_pretrained(model_name)
             self.model = VisionEncoderDecoderModel.from_pretrained(model_name)
+            self.model.eval()
             
             # Move to GPU if available
             if torch.cuda.is_available():
@@ -33,19 +52,29 @@ class ImageProcessor:
             else:
                 self.device = 'CPU'
             
-            logger.info(f"✅ Loaded TrOCR model: {model_name} on {self.device}")
+            self.scheduler = BatchedTrOCRScheduler(
+                self.recognize_batch,
+                max_batch_size=batch_size,
+                max_wait=max_batch_wait
+            )
+            
+            logger.info("Loaded TrOCR model: %s on %s", model_name, self.device)
             
         except Exception as e:
-            logger.error(f"❌ Failed to load TrOCR model: {str(e)}")
+            logger.error("Failed to load TrOCR model: %s", e)
             raise Exception(f"Could not initialize TrOCR: {str(e)}")
     
-    def preprocess_image(self, image_path):
-        """Load and preprocess image for better OCR results"""
+    def preprocess_image(self, image_source):
+        """Load and preprocess image for better OCR results (path or file-like/mmap buffer)"""
         try:
-            logger.info(f"🖼️ Preprocessing image: {image_path}")
+            if isinstance(image_source, (str, os.PathLike)):
+                logger.info("Preprocessing image: %s", image_source)
+            else:
+                logger.info("Preprocessing image from memory buffer")
+                image_source.seek(0)
             
             # Load image
-            image = Image.open(image_path)
+            image = Image.open(image_source)
             
             # Convert to RGB (TrOCR expects RGB)
             if image.mode != 'RGB':
@@ -53,7 +82,7 @@ class ImageProcessor:
             
             # Get original dimensions
             width, height = image.size
-            logger.info(f"📏 Original image size: {width}x{height}")
+            logger.info("Original image size: %sx%s", width, height)
             
             # Resize if too large (for memory efficiency)
             max_dimension = 2048
@@ -67,12 +96,12 @@ class ImageProcessor:
                     new_width = int((width * max_dimension) / height)
                 
                 image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                logger.info(f"📐 Resized to: {new_width}x{new_height}")
+                logger.info("Resized to: %sx%s", new_width, new_height)
             
             return image, None
             
         except Exception as e:
-            logger.error(f"❌ Error preprocessing image: {str(e)}")
+            logger.error("Error preprocessing image: %s", e)
             return None, f"Image preprocessing failed: {str(e)}"
     
     def enhance_image(self, image):
@@ -92,27 +121,32 @@ class ImageProcessor:
             return enhanced
             
         except Exception as e:
-            logger.warning(f"⚠️ Image enhancement failed: {str(e)}")
+            logger.warning("Image enhancement failed: %s", e)
             return image  # Return original if enhancement fails
     
+    def recognize_batch(self, images):
+        """Run TrOCR on a list of RGB images in one forward pass, returning one string per image"""
+        # Process images for model input (TrOCR resizes every image to the same input size)
+        pixel_values = self.processor(images, return_tensors="pt").pixel_values
+        
+        # Move to GPU if model is on GPU
+        if next(self.model.parameters()).is_cuda:
+            pixel_values = pixel_values.to('cuda')
+        
+        # Generate text (greedy decoding)
+        with torch.inference_mode():
+            generated_ids = self.model.generate(pixel_values, max_length=512, num_beams=1)
+        
+        # Decode generated text
+        return self.processor.batch_decode(generated_ids, skip_special_tokens=True)
+    
     def extract_text_with_trocr(self, image):
         """Extract text using TrOCR model"""
         try:
-            logger.info("🔤 Extracting text with TrOCR")
-            
-            # Process image for model input
-            pixel_values = self.processor(image, return_tensors="pt").pixel_values
-            
-            # Move to GPU if model is on GPU
-            if next(self.model.parameters()).is_cuda:
-                pixel_values = pixel_values.to('cuda')
-            
-            # Generate text
-            with torch.no_grad():
-                generated_ids = self.model.generate(pixel_values, max_length=512)
+            logger.info("Extracting text with TrOCR")
             
-            # Decode generated text
-            extracted_text = self.processor.batch_decode(generated_ids, skip_special_tokens=True)[0]
+            # Batched with other concurrent requests
+            extracted_text = self.scheduler.submit(image).result()
             
             # Clean up text
             extracted_text = extracted_text.strip()
@@ -120,18 +154,18 @@ class ImageProcessor:
             if not extracted_text:
                 return None, "No text detected in image"
             
-            logger.info(f"✅ Text extraction completed: {len(extracted_text)} characters")
+            logger.info("Text extraction completed: %d characters", len(extracted_text))
             return extracted_text, None
             
         except Exception as e:
-            logger.error(f"❌ Error during text extraction: {str(e)}")
+            logger.error("Error during text extraction: %s", e)
             return None, f"Text extraction failed: {str(e)}"
     
-    def process_image_file(self, image_path):
+    def process_image_file(self, image_source):
         """Complete image processing pipeline with fallback strategies"""
         try:
             # Step 1: Preprocess image
-            image, error = self.preprocess_image(image_path)
+            image, error = self.preprocess_image(image_source)
             if error:
                 return None, error
             
@@ -141,14 +175,14 @@ class ImageProcessor:
                 return text, None
             
             # Step 3: Try with enhanced image if first attempt failed
-            logger.info("🔧 Trying with enhanced image...")
+            logger.info("Trying with enhanced image...")
             enhanced_image = self.enhance_image(image)
             text, error = self.extract_text_with_trocr(enhanced_image)
             if text and len(text.strip()) > 5:  # Accept shorter text on retry
                 return text, None
             
             # Step 4: Try grayscale conversion
-            logger.info("🔧 Trying with grayscale conversion...")
+            logger.info("Trying with grayscale conversion...")
             gray_image = image.convert('L').convert('RGB')  # Convert back to RGB
             text, error = self.extract_text_with_trocr(gray_image)
             if text and len(text.strip()) > 3:  # Accept even shorter text
@@ -157,9 +191,18 @@ class ImageProcessor:
             return None, "Could not extract meaningful text after multiple attempts"
             
         except Exception as e:
-            logger.error(f"❌ Image processing pipeline failed: {str(e)}")
+            logger.error("Image processing pipeline failed: %s", e)
             return None, f"Image processing failed: {str(e)}"
     
+    def warmup(self):
+        """Run a blank image through TrOCR to avoid a cold first request"""
+        try:
+            # Call the model directly - the batch worker thread must not start before a fork
+            self.recognize_batch([Image.new('RGB', (384, 64), 'white')])
+            logger.info("TrOCR model warmed up")
+        except Exception as e:
+            logger.warning("TrOCR warmup failed: %s", e)
+    
     def validate_image_file(self, file_path):
         """Validate image file before processing"""
         try:
@@ -7,8 +7,8 @@ class TextAnalyzer:
     def __init__(self):
         self.emotional_words = ['shocking', 'unbelievable', 'breaking', 'exclusive']
     
-    def analyze_text(self, text, source_score=5):
-        """Simple text analysis"""
+    def analyze_text(self, text, source_score=5, tokens=None):
+        """Simple text analysis (tokens: optional pre-split text.split() to avoid re-scanning)"""
         text_lower = text.lower()
         red_flags = 0
         issues = []
@@ -41,7 +41,7 @@ class TextAnalyzer:
             'red_flags_count': red_flags,
             'issues_found': issues,
             'text_stats': {
-                'word_count': len(text.split()),
+                'word_count': len(tokens) if tokens is not None else len(text.split()),
                 'character_count': len(text)
             }
         }
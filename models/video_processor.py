@@ -4,18 +4,49 @@ Complete Whisper integration for video transcription
 """
 from transformers import pipeline
 import torch
+import numpy as np
 from moviepy.editor import VideoFileClip
 import os
 import tempfile
+import wave
 import logging
+from models.batching import MicroBatchScheduler
 
 logger = logging.getLogger(__name__)
 
+class BatchedWhisperScheduler(MicroBatchScheduler):
+    # Duration buckets in seconds - clips of similar length pad less when batched
+    DURATION_BUCKETS = (10, 30, 120)
+    
+    def __init__(self, transcriber, max_batch_size=8, max_wait=0.05):
+        """Group concurrent transcriptions into a single Whisper pipeline call"""
+        super().__init__(max_batch_size=max_batch_size, max_wait=max_wait)
+        self.transcriber = transcriber
+    
+    def bucket_key(self, audio_path):
+        """Bucket WAV files by duration"""
+        with wave.open(audio_path, 'rb') as audio:
+            duration = audio.getnframes() / audio.getframerate()
+        
+        for limit in self.DURATION_BUCKETS:
+            if duration < limit:
+                return limit
+        return None
+    
+    def run_batch(self, audio_paths):
+        """Transcribe a batch of audio files with one pipeline call"""
+        if len(audio_paths) > 1:
+            logger.info("Transcribing batch of %d audio files", len(audio_paths))
+        results = self.transcriber(audio_paths, batch_size=len(audio_paths))
+        return [result.get("text", "") for result in results]
+
 class VideoProcessor:
-    def __init__(self, model_size="base"):
+    def __init__(self, model_size="base", batch_size=8, max_batch_wait=0.05):
         """
         Initialize video processor with Whisper
         model_size options: tiny, base, small, medium, large
+        batch_size / max_batch_wait: concurrent transcriptions arriving within
+        max_batch_wait seconds share one Whisper call of up to batch_size files
         """
         self.model_size = model_size
         self.model_name = f"openai/whisper-{model_size}"
@@ -31,15 +62,20 @@ class VideoProcessor:
                 device=self.device,
                 return_timestamps=False  # Set to True if you want timestamps
             )
-            logger.info(f"✅ Loaded Whisper model: {self.model_name} on {'GPU' if self.device >= 0 else 'CPU'}")
+            self.scheduler = BatchedWhisperScheduler(
+                self.transcriber,
+                max_batch_size=batch_size,
+                max_wait=max_batch_wait
+            )
+            logger.info("Loaded Whisper model: %s on %s", self.model_name, 'GPU' if self.device >= 0 else 'CPU')
         except Exception as e:
-            logger.error(f"❌ Failed to load Whisper model: {str(e)}")
+            logger.error("Failed to load Whisper model: %s", e)
             raise Exception(f"Could not initialize Whisper: {str(e)}")
     
     def extract_audio_from_video(self, video_path):
         """Extract audio from video file using MoviePy"""
         try:
-            logger.info(f"🎬 Extracting audio from: {video_path}")
+            logger.info("Extracting audio from: %s", video_path)
             
             # Load video
             video = VideoFileClip(video_path)
@@ -62,32 +98,29 @@ class VideoProcessor:
             # Clean up video object
             video.close()
             
-            logger.info(f"✅ Audio extracted successfully to: {audio_path}")
+            logger.info("Audio extracted successfully to: %s", audio_path)
             return audio_path, None
             
         except Exception as e:
-            logger.error(f"❌ Error extracting audio: {str(e)}")
+            logger.error("Error extracting audio: %s", e)
             return None, f"Failed to extract audio: {str(e)}"
     
     def transcribe_audio(self, audio_path):
         """Transcribe audio using Whisper"""
         try:
-            logger.info(f"🎤 Transcribing audio with Whisper {self.model_size}")
-            
-            # Transcribe with Whisper
-            result = self.transcriber(audio_path)
+            logger.info("Transcribing audio with Whisper %s", self.model_size)
             
-            # Extract text from result
-            transcript = result.get("text", "").strip()
+            # Transcribe with Whisper (batched with other concurrent requests)
+            transcript = self.scheduler.submit(audio_path).result().strip()
             
             if not transcript:
                 return None, "No speech detected in audio"
             
-            logger.info(f"✅ Transcription completed: {len(transcript)} characters")
+            logger.info("Transcription completed: %d characters", len(transcript))
             return transcript, None
             
         except Exception as e:
-            logger.error(f"❌ Error during transcription: {str(e)}")
+            logger.error("Error during transcription: %s", e)
             return None, f"Transcription failed: {str(e)}"
     
     def process_video_file(self, video_path):
@@ -108,7 +141,7 @@ class VideoProcessor:
             return transcript, None
             
         except Exception as e:
-            logger.error(f"❌ Video processing pipeline failed: {str(e)}")
+            logger.error("Video processing pipeline failed: %s", e)
             return None, f"Video processing failed: {str(e)}"
             
         finally:
@@ -116,9 +149,18 @@ class VideoProcessor:
             if audio_path and os.path.exists(audio_path):
                 try:
                     os.remove(audio_path)
-                    logger.info("🧹 Temporary audio file cleaned up")
+                    logger.info("Temporary audio file cleaned up")
                 except Exception as cleanup_error:
-                    logger.warning(f"⚠️ Could not clean up temp file: {str(cleanup_error)}")
+                    logger.warning("Could not clean up temp file: %s", cleanup_error)
+    
+    def warmup(self):
+        """Run one second of silence through Whisper to avoid a cold first request"""
+        try:
+            # Call the pipeline directly - the batch worker thread must not start before a fork
+            self.transcriber({'raw': np.zeros(16000, dtype=np.float32), 'sampling_rate': 16000})
+            logger.info("Whisper model warmed up")
+        except Exception as e:
+            logger.warning("Whisper warmup failed: %s", e)
     
     def validate_video_file(self, file_path):
         """Validate video file before processing"""
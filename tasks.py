@@ -0,0 +1,51 @@
+# tasks.py
+"""
+Celery tasks for long-running video/image analysis
+
+Enable by setting CELERY_BROKER_URL (e.g. redis://localhost:6379/0) for both the
+API and the worker; results go to CELERY_RESULT_BACKEND (defaults to the broker).
+The API and workers must share the uploads folder.
+
+With a broker configured the API only saves uploads and enqueues jobs, so web
+nodes can run with LOAD_MEDIA_MODELS=0 to skip loading Whisper/TrOCR entirely.
+Workers must keep the default (LOAD_MEDIA_MODELS=1) since they run the models.
+
+Start a worker with: celery -A tasks worker --concurrency=2 --pool=prefork
+"""
+import os
+from celery import Celery
+from celery.signals import worker_process_init
+
+broker_url = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')
+
+celery_app = Celery(
+    'misinformation_detection',
+    broker=broker_url,
+    backend=os.getenv('CELERY_RESULT_BACKEND', broker_url)
+)
+celery_app.conf.update(
+    task_serializer='json',
+    result_serializer='json',
+    accept_content=['json'],
+    result_expires=3600,  # Clients poll /jobs/<id>; keep results for an hour
+    task_track_started=True,
+    task_acks_late=True,
+    worker_prefetch_multiplier=1  # Jobs are long - don't let one worker hoard them
+)
+
+@worker_process_init.connect
+def load_models(**kwargs):
+    """Import the app once per worker process so Whisper/TrOCR load before the first job"""
+    import app  # noqa: F401
+
+@celery_app.task(name='analyze_video')
+def analyze_video_task(video_path, original_filename):
+    """Transcribe and analyze an uploaded video"""
+    from app import run_video_analysis
+    return run_video_analysis(video_path, original_filename)
+
+@celery_app.task(name='analyze_image')
+def analyze_image_task(image_path, original_filename):
+    """Extract and analyze text from an uploaded image"""
+    from app import run_image_analysis
+    return run_image_analysis(image_path, original_filename)
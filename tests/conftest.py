@@ -0,0 +1,27 @@
+# tests/conftest.py
+"""
+Shared fixtures for the Flask app tests
+"""
+import os
+import sys
+
+import pytest
+
+# Keep Whisper/TrOCR out of the test process - media routes become 503 stubs
+os.environ.setdefault('LOAD_MEDIA_MODELS', '0')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def app_module():
+    """The imported app module, with an empty analysis cache"""
+    import app as app_module
+    app_module.analysis_cache.clear()
+    yield app_module
+    app_module.analysis_cache.clear()
+
+
+@pytest.fixture
+def client(app_module):
+    app_module.app.config['TESTING'] = True
+    return app_module.app.test_client()
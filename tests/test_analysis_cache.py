@@ -0,0 +1,159 @@
+# tests/test_analysis_cache.py
+"""
+Tests for the content-hash cache in front of text analysis and enrichment
+"""
+import pytest
+
+TEXT = 'Scientists confirm the new bridge opened to traffic this morning.'
+
+
+class FakeLookup:
+    """Stands in for FactCheckAPI / NewsVerifier and counts outbound calls"""
+    
+    def __init__(self, status_field, result=None, error=None, api_key='test-key'):
+        self.status_field = status_field
+        self.result = result if result is not None else {'found': 1}
+        self.error = error
+        self.google_api_key = self.api_key = api_key
+        self.calls = 0
+    
+    def lookup(self, text):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return self.result
+    
+    check_claims_with_google = lookup
+    verify_news_claims = lookup
+    
+    def integrate_with_analysis(self, analysis, data):
+        if 'error' in data:
+            analysis[self.status_field] = 'unavailable'
+        else:
+            analysis[self.status_field] = data
+        return analysis
+
+
+@pytest.fixture
+def lookups(app_module, monkeypatch):
+    fact_checker = FakeLookup('fact_check_status')
+    news_verifier = FakeLookup('news_verification')
+    monkeypatch.setattr(app_module, 'fact_checker', fact_checker)
+    monkeypatch.setattr(app_module, 'news_verifier', news_verifier)
+    return fact_checker, news_verifier
+
+
+@pytest.fixture
+def analyze_calls(app_module, monkeypatch):
+    """Count TextAnalyzer.analyze_text calls"""
+    calls = []
+    original = app_module.text_analyzer.analyze_text
+    
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+    
+    monkeypatch.setattr(app_module.text_analyzer, 'analyze_text', counting)
+    return calls
+
+
+def post_text(client, text=TEXT):
+    response = client.post('/analyze/text', json={'text': text})
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_repeat_request_is_served_from_cache(client, lookups, analyze_calls):
+    fact_checker, news_verifier = lookups
+    
+    first = post_text(client)
+    second = post_text(client)
+    
+    assert len(analyze_calls) == 1
+    assert fact_checker.calls == news_verifier.calls == 1
+    assert first['analysis'] == second['analysis']
+    assert first['enhanced_features'] == second['enhanced_features']
+
+
+def test_different_text_is_a_cache_miss(client, lookups, analyze_calls):
+    post_text(client)
+    post_text(client, TEXT + ' Officials expect heavy use.')
+    
+    assert len(analyze_calls) == 2
+
+
+def test_per_request_fields_do_not_leak_into_cache(client, app_module, lookups):
+    post_text(client)
+    
+    cached, = app_module.analysis_cache._cache.values()
+    assert 'recommendations' not in cached['analysis']
+
+
+@pytest.mark.parametrize('failure', [
+    {'error': RuntimeError('timeout')},
+    {'result': {'error': 'API request failed: 503 Server Error'}},
+])
+def test_failed_lookup_is_not_cached(client, app_module, monkeypatch, analyze_calls, failure):
+    fact_checker = FakeLookup('fact_check_status', **failure)
+    monkeypatch.setattr(app_module, 'fact_checker', fact_checker)
+    monkeypatch.setattr(app_module, 'news_verifier', FakeLookup('news_verification'))
+    
+    first = post_text(client)
+    assert first['analysis']['fact_check_status'] in ('failed', 'unavailable')
+    
+    post_text(client)
+    
+    assert len(analyze_calls) == 2
+    assert fact_checker.calls == 2
+    assert len(app_module.analysis_cache._cache) == 0
+
+
+def test_unconfigured_lookup_is_cached(client, app_module, monkeypatch, analyze_calls):
+    fact_checker = FakeLookup('fact_check_status', result={'error': 'API key not configured'}, api_key=None)
+    news_verifier = FakeLookup('news_verification', result={'error': 'API key not configured'}, api_key=None)
+    monkeypatch.setattr(app_module, 'fact_checker', fact_checker)
+    monkeypatch.setattr(app_module, 'news_verifier', news_verifier)
+    
+    first = post_text(client)
+    assert first['analysis']['fact_check_status'] == 'unavailable'
+    assert first['analysis']['news_verification'] == 'unavailable'
+    
+    post_text(client)
+    post_text(client)
+    
+    assert len(analyze_calls) == 1
+    assert len(app_module.analysis_cache._cache) == 1
+
+
+def test_missing_api_keys_do_not_disable_caching(client, app_module, monkeypatch, analyze_calls):
+    monkeypatch.delenv('GOOGLE_FACT_CHECK_API_KEY', raising=False)
+    monkeypatch.delenv('NEWSAPI_API_KEY', raising=False)
+    monkeypatch.setattr(app_module, 'fact_checker', app_module.FactCheckAPI())
+    monkeypatch.setattr(app_module, 'news_verifier', app_module.NewsVerifier())
+    
+    for _ in range(3):
+        post_text(client)
+    
+    assert len(analyze_calls) == 1
+    assert len(app_module.analysis_cache._cache) == 1
+
+
+def test_recovered_lookup_is_cached(client, app_module, monkeypatch, analyze_calls):
+    fact_checker = FakeLookup('fact_check_status', error=RuntimeError('timeout'))
+    monkeypatch.setattr(app_module, 'fact_checker', fact_checker)
+    monkeypatch.setattr(app_module, 'news_verifier', FakeLookup('news_verification'))
+    
+    post_text(client)
+    fact_checker.error = None
+    post_text(client)
+    post_text(client)
+    
+    assert len(analyze_calls) == 2
+    assert fact_checker.calls == 2
+
+
+def test_analysis_cache_ttl_is_no_longer_than_sub_caches(app_module):
+    ttl = app_module.analysis_cache._cache.ttl
+    
+    assert ttl <= app_module.fact_checker.cache._cache.ttl
+    assert ttl <= app_module.news_verifier.cache._cache.ttl
@@ -0,0 +1,122 @@
+# tests/test_batching.py
+"""
+Tests for the micro-batching scheduler
+"""
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.batching import MicroBatchScheduler
+
+
+class RecordingScheduler(MicroBatchScheduler):
+    """Doubles each item and records the batches it was called with"""
+    
+    def __init__(self, fail_with=None, drop=0, bucket=None, **kwargs):
+        super().__init__(**kwargs)
+        self.batches = []
+        self.fail_with = fail_with
+        self.drop = drop
+        self.bucket = bucket
+    
+    def bucket_key(self, item):
+        return self.bucket(item) if self.bucket else None
+    
+    def run_batch(self, items):
+        self.batches.append(list(items))
+        if self.fail_with:
+            raise self.fail_with
+        results = [item * 2 for item in items]
+        return results[:len(results) - self.drop]
+
+
+def submit_all(scheduler, items):
+    """Submit items from one thread so they land in the same collection window"""
+    return [scheduler.submit(item) for item in items]
+
+
+def test_concurrent_items_share_one_batch():
+    scheduler = RecordingScheduler(max_batch_size=8, max_wait=0.5)
+    futures = submit_all(scheduler, [1, 2, 3])
+    
+    assert [f.result(timeout=5) for f in futures] == [2, 4, 6]
+    assert scheduler.batches == [[1, 2, 3]]
+
+
+def test_batches_are_capped_at_max_batch_size():
+    scheduler = RecordingScheduler(max_batch_size=2, max_wait=0.5)
+    futures = submit_all(scheduler, [1, 2, 3, 4, 5])
+    
+    assert [f.result(timeout=5) for f in futures] == [2, 4, 6, 8, 10]
+    assert all(len(batch) <= 2 for batch in scheduler.batches)
+    assert sorted(x for batch in scheduler.batches for x in batch) == [1, 2, 3, 4, 5]
+
+
+def test_items_are_grouped_by_bucket():
+    scheduler = RecordingScheduler(max_batch_size=8, max_wait=0.5, bucket=lambda x: x % 2)
+    futures = submit_all(scheduler, [1, 2, 3, 4])
+    
+    assert [f.result(timeout=5) for f in futures] == [2, 4, 6, 8]
+    assert sorted(scheduler.batches) == [[1, 3], [2, 4]]
+
+
+def test_bucket_key_errors_fall_back_to_default_bucket():
+    def bucket(item):
+        if item == 2:
+            raise ValueError("unreadable")
+        return None
+    
+    scheduler = RecordingScheduler(max_batch_size=8, max_wait=0.5, bucket=bucket)
+    futures = submit_all(scheduler, [1, 2, 3])
+    
+    assert [f.result(timeout=5) for f in futures] == [2, 4, 6]
+    assert scheduler.batches == [[1, 2, 3]]
+
+
+def test_run_batch_exception_reaches_every_future():
+    error = RuntimeError("model exploded")
+    scheduler = RecordingScheduler(fail_with=error, max_batch_size=8, max_wait=0.5)
+    futures = submit_all(scheduler, [1, 2, 3])
+    
+    for future in futures:
+        with pytest.raises(RuntimeError, match="model exploded"):
+            future.result(timeout=5)
+
+
+def test_short_result_list_fails_every_future_instead_of_hanging():
+    scheduler = RecordingScheduler(drop=1, max_batch_size=8, max_wait=0.5)
+    futures = submit_all(scheduler, [1, 2, 3])
+    
+    for future in futures:
+        with pytest.raises(RuntimeError, match="2 results for 3 items"):
+            future.result(timeout=5)
+
+
+def test_worker_survives_a_failed_batch():
+    scheduler = RecordingScheduler(fail_with=RuntimeError("boom"), max_wait=0.01)
+    with pytest.raises(RuntimeError):
+        scheduler.submit(1).result(timeout=5)
+    
+    scheduler.fail_with = None
+    assert scheduler.submit(2).result(timeout=5) == 4
+
+
+def test_submissions_from_many_threads_all_resolve():
+    scheduler = RecordingScheduler(max_batch_size=4, max_wait=0.05)
+    results = {}
+    
+    def worker(n):
+        results[n] = scheduler.submit(n).result(timeout=5)
+    
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert results == {n: n * 2 for n in range(20)}
+    assert all(len(batch) <= 4 for batch in scheduler.batches)
@@ -0,0 +1,140 @@
+# tests/test_uploads.py
+"""
+Tests for upload filename parsing and the zero-copy upload save
+"""
+import io
+import os
+import tempfile
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+SPOOL_MAX_SIZE = 1024 * 500  # Werkzeug's default_stream_factory threshold
+SMALL = os.urandom(1024)
+PAYLOAD = os.urandom(3 * (1 << 20) + 123)  # Past the spool threshold, spans several copy chunks
+
+
+@pytest.fixture
+def sendfile_calls(app_module, monkeypatch):
+    calls = []
+    real_sendfile = os.sendfile
+    
+    def counting(*args):
+        calls.append(args)
+        return real_sendfile(*args)
+    
+    monkeypatch.setattr(app_module.os, 'sendfile', counting)
+    return calls
+
+
+def spooled_upload(data):
+    """FileStorage backed by the same SpooledTemporaryFile Werkzeug parses file parts into"""
+    stream = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE, mode='rb+')
+    stream.write(data)
+    stream.seek(0)
+    return FileStorage(stream=stream, filename='clip.mp4')
+
+
+def test_rolled_over_upload_is_saved_with_sendfile(app_module, sendfile_calls, tmp_path):
+    upload = spooled_upload(PAYLOAD)
+    assert upload.stream._rolled
+    target = tmp_path / 'out.bin'
+    
+    app_module._save_upload(upload, os.fspath(target))
+    
+    assert sendfile_calls
+    assert target.read_bytes() == PAYLOAD
+
+
+def test_in_memory_spool_is_copied_without_rollover(app_module, sendfile_calls, tmp_path):
+    upload = spooled_upload(SMALL)
+    target = tmp_path / 'out.bin'
+    
+    app_module._save_upload(upload, os.fspath(target))
+    
+    assert not upload.stream._rolled
+    assert not sendfile_calls
+    assert target.read_bytes() == SMALL
+
+
+def test_bytesio_upload_uses_buffered_copy(app_module, sendfile_calls, tmp_path):
+    target = tmp_path / 'out.bin'
+    upload = FileStorage(stream=io.BytesIO(PAYLOAD), filename='photo.png')
+    
+    app_module._save_upload(upload, os.fspath(target))
+    
+    assert not sendfile_calls
+    assert target.read_bytes() == PAYLOAD
+
+
+@pytest.mark.parametrize('data, uses_sendfile', [(SMALL, False), (PAYLOAD, True)])
+def test_multipart_upload_is_saved_intact(app_module, sendfile_calls, tmp_path, data, uses_sendfile):
+    target = tmp_path / 'out.bin'
+    form = {'image': (io.BytesIO(data), 'photo.png')}
+    with app_module.app.test_request_context('/analyze/image', method='POST', data=form):
+        upload = app_module.request.files['image']
+        app_module._save_upload(upload, os.fspath(target))
+        rolled = upload.stream._rolled
+    
+    assert rolled == uses_sendfile
+    assert bool(sendfile_calls) == uses_sendfile
+    assert target.read_bytes() == data
+
+
+def test_sendfile_error_falls_back_to_buffered_copy(app_module, monkeypatch, tmp_path):
+    def failing_sendfile(*args):
+        raise OSError('sendfile not supported on this filesystem')
+    
+    monkeypatch.setattr(app_module.os, 'sendfile', failing_sendfile)
+    target = tmp_path / 'out.bin'
+    
+    app_module._save_upload(spooled_upload(PAYLOAD), os.fspath(target))
+    
+    assert target.read_bytes() == PAYLOAD
+
+
+def test_both_paths_save_identical_bytes(app_module, tmp_path):
+    via_sendfile = tmp_path / 'sendfile.bin'
+    via_copy = tmp_path / 'copy.bin'
+    
+    app_module._save_upload(spooled_upload(PAYLOAD), os.fspath(via_sendfile))
+    app_module._save_upload(FileStorage(stream=io.BytesIO(PAYLOAD)), os.fspath(via_copy))
+    
+    assert via_sendfile.read_bytes() == via_copy.read_bytes() == PAYLOAD
+
+
+def test_save_starts_from_current_stream_position(app_module, tmp_path):
+    upload = spooled_upload(b'HEADER' + PAYLOAD)
+    upload.stream.seek(len(b'HEADER'))
+    target = tmp_path / 'out.bin'
+    
+    app_module._save_upload(upload, os.fspath(target))
+    
+    assert target.read_bytes() == PAYLOAD
+
+
+@pytest.mark.parametrize('filename, expected', [
+    ('photo.PNG', ('png', True)),
+    ('archive.tar.gz', ('gz', False)),
+    ('no_extension', ('', False)),
+    ('trailing.', ('', False)),
+    ('.webp', ('webp', True)),
+])
+def test_parse_upload(app_module, filename, expected):
+    assert app_module._parse_upload(filename, app_module.ALLOWED_IMAGE_EXTENSIONS) == expected
+
+
+@pytest.mark.parametrize('filename, received_format', [
+    ('notes.TXT', 'txt'),
+    ('no_extension', 'unknown'),
+])
+def test_rejected_image_reports_received_format(app_module, filename, received_format):
+    # The /analyze/image route is a 503 stub without TrOCR, so call the view directly
+    data = {'image': (io.BytesIO(b'not an image'), filename)}
+    with app_module.app.test_request_context('/analyze/image', method='POST', data=data):
+        response, status = app_module.analyze_image()
+    
+    assert status == 400
+    body = response.get_json()
+    assert body['error'] == 'Invalid image format'
+    assert body['received_format'] == received_format
@@ -0,0 +1,49 @@
+# tests/test_validation.py
+"""
+Tests for the @validate request-schema decorator on the JSON endpoints
+"""
+import pytest
+
+
+@pytest.mark.parametrize('path, field', [('/analyze/text', 'text'), ('/analyze/url', 'url')])
+def test_missing_field_is_rejected(client, path, field):
+    response = client.post(path, json={})
+    
+    assert response.status_code == 400
+    body = response.get_json()
+    assert field in body['error']
+    assert field in body['example']
+
+
+@pytest.mark.parametrize('path', ['/analyze/text', '/analyze/url'])
+def test_wrong_type_is_rejected(client, path):
+    field = path.rsplit('/', 1)[1]
+    response = client.post(path, json={field: 5})
+    
+    assert response.status_code == 400
+    assert response.get_json()['error'].startswith('Invalid request:')
+
+
+@pytest.mark.parametrize('path', ['/analyze/text', '/analyze/url'])
+def test_malformed_json_is_rejected(client, path):
+    response = client.post(path, data='{"text": ', content_type='application/json')
+    
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Request body must be valid JSON'
+
+
+def test_empty_body_is_rejected(client):
+    response = client.post('/analyze/text', data='', content_type='application/json')
+    
+    assert response.status_code == 400
+    assert 'example' in response.get_json()
+
+
+def test_valid_payload_reaches_the_view(client, app_module, monkeypatch):
+    monkeypatch.setattr(app_module, 'fact_checker', None)
+    monkeypatch.setattr(app_module, 'news_verifier', None)
+    
+    response = client.post('/analyze/text', json={'text': '   '})
+    
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Text content cannot be empty'
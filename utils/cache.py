@@ -0,0 +1,40 @@
+# utils/cache.py
+"""
+Content-hash keyed caches for repeated analysis work
+"""
+import hashlib
+import threading
+from cachetools import TTLCache
+
+ONE_DAY = 24 * 60 * 60
+ONE_WEEK = 7 * ONE_DAY
+
+def content_hash(*parts):
+    """Stable short digest of the given values (order matters)"""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\x00')  # Separator so ('ab', 'c') != ('a', 'bc')
+    return digest.hexdigest()
+
+class ContentCache:
+    def __init__(self, maxsize=10_000, ttl=ONE_WEEK):
+        """Thread-safe TTL cache (Flask serves requests from several threads)"""
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Return cached value or None"""
+        with self._lock:
+            return self._cache.get(key)
+    
+    def set(self, key, value):
+        """Store value under key"""
+        with self._lock:
+            self._cache[key] = value
+        return value
+    
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._cache.clear()
@@ -5,6 +5,8 @@ Google Fact Check API integration for claim verification
 import requests
 import os
 import logging
+from utils.http import make_pooled_session
+from utils.cache import ContentCache, content_hash
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +14,8 @@ class FactCheckAPI:
     def __init__(self):
         self.google_api_key = os.getenv('GOOGLE_FACT_CHECK_API_KEY')
         self.base_url = 'https://factchecktools.googleapis.com/v1alpha1/claims:search'
+        self.cache = ContentCache()
+        self.session = make_pooled_session()
         
     def check_claims_with_google(self, text):
         """Query Google Fact Check Tools API for claim verification"""
@@ -21,6 +25,12 @@ class FactCheckAPI:
         # Extract key phrases from text (simple approach)
         query = self._extract_key_claims(text)
         
+        # Different texts often reduce to the same query - reuse earlier results
+        cache_key = content_hash('fact_check', query)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         params = {
             'key': self.google_api_key,
             'query': query,
@@ -29,14 +39,14 @@ class FactCheckAPI:
         }
         
         try:
-            response = requests.get(self.base_url, params=params, timeout=10)
+            response = self.session.get(self.base_url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
             
-            return self._process_fact_check_results(data)
+            return self.cache.set(cache_key, self._process_fact_check_results(data))
             
         except requests.exceptions.RequestException as e:
-            logger.error(f"Fact check API request failed: {str(e)}")
+            logger.error("Fact check API request failed: %s", e)
             return {'error': f'API request failed: {str(e)}'}
     
     def _extract_key_claims(self, text):
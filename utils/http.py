@@ -0,0 +1,14 @@
+# utils/http.py
+"""
+Shared HTTP session with keep-alive connection pooling
+"""
+import requests
+from requests.adapters import HTTPAdapter
+
+def make_pooled_session(pool_maxsize=64):
+    """Session that reuses TCP/TLS connections across requests and threads"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_maxsize)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
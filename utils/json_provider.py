@@ -0,0 +1,23 @@
+# utils/json_provider.py
+"""
+orjson-backed JSON provider for Flask (faster serialization of large analysis payloads)
+"""
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+class ORJSONProvider(DefaultJSONProvider):
+    # Key order is already meaningful in our responses; sorting only costs time
+    sort_keys = False
+    
+    def dumps(self, obj, **kwargs):
+        """Serialize with orjson, falling back to Flask's default() for dates, UUIDs, etc."""
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        if kwargs.get('sort_keys'):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        """Parse JSON text or bytes with orjson"""
+        return orjson.loads(s)
@@ -5,7 +5,9 @@ NewsAPI integration for cross-referencing claims with recent news
 import requests
 import os
 import logging
+from utils.http import make_pooled_session
 from datetime import datetime, timedelta
+from utils.cache import ONE_DAY, ContentCache, content_hash
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +15,8 @@ class NewsVerifier:
     def __init__(self):
         self.api_key = os.getenv('NEWSAPI_API_KEY')
         self.base_url = 'https://newsapi.org/v2/everything'
+        self.cache = ContentCache(ttl=ONE_DAY)  # News goes stale faster than fact-checks
+        self.session = make_pooled_session()
         
     def verify_news_claims(self, text, max_articles=5):
         """Cross-reference text claims with recent news articles"""
@@ -22,6 +26,11 @@ class NewsVerifier:
         # Extract keywords for news search
         keywords = self._extract_keywords(text)
         
+        cache_key = content_hash('news', keywords, max_articles)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         params = {
             'q': keywords,
             'language': 'en',
@@ -32,14 +41,14 @@ class NewsVerifier:
         }
         
         try:
-            response = requests.get(self.base_url, params=params, timeout=10)
+            response = self.session.get(self.base_url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
             
-            return self._process_news_results(data, keywords)
+            return self.cache.set(cache_key, self._process_news_results(data, keywords))
             
         except requests.exceptions.RequestException as e:
-            logger.error(f"NewsAPI request failed: {str(e)}")
+            logger.error("NewsAPI request failed: %s", e)
             return {'error': f'News verification failed: {str(e)}'}
     
     def _extract_keywords(self, text):
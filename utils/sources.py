@@ -2,6 +2,7 @@
 """
 Source credibility database and checking functions
 """
+from functools import lru_cache
 
 # Highly reliable sources (score: 8-10)
 RELIABLE_SOURCES = {
@@ -44,6 +45,12 @@ def check_source_credibility(url):
             'reason': 'Could not extract domain from URL'
         }
     
+    # Copy the cached entry so callers can never mutate it
+    return {**_credibility_for_domain(domain), 'domain': domain}
+
+@lru_cache(maxsize=4096)
+def _credibility_for_domain(domain):
+    """Credibility lookup for a single domain (cached for the worker lifetime)"""
     if domain in RELIABLE_SOURCES:
         source_info = RELIABLE_SOURCES[domain]
         return {
@@ -68,3 +75,7 @@ def check_source_credibility(url):
         'score': 5,
         'reason': 'Source not in database - verify independently'
     }
+
+def clear_credibility_cache():
+    """Forget cached domain lookups (after editing the source lists)"""
+    _credibility_for_domain.cache_clear()
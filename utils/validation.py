@@ -0,0 +1,29 @@
+# utils/validation.py
+"""
+Request schemas and a validation decorator that decodes and validates JSON in one pass
+"""
+from functools import wraps
+import msgspec
+from flask import request, jsonify
+
+class TextRequest(msgspec.Struct):
+    text: str
+
+class UrlRequest(msgspec.Struct):
+    url: str
+
+def validate(schema, example=None):
+    """Decode the raw request body straight into `schema`; respond 400 on any mismatch"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                payload = msgspec.json.decode(request.get_data(cache=False), type=schema)
+            except msgspec.ValidationError as e:
+                return jsonify({'error': f'Invalid request: {e}', 'example': example}), 400
+            except msgspec.DecodeError:
+                return jsonify({'error': 'Request body must be valid JSON', 'example': example}), 400
+            
+            return view(payload, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -28,9 +28,16 @@ class WebScraper:
             paragraphs = soup.find_all('p')
             main_content = ' '.join([p.get_text(strip=True) for p in paragraphs])
             
+            truncated_content = main_content[:5000]
+            
+            # Build the analysis text once so callers don't re-concatenate or re-split it
+            combined_text = f"{title_text} {truncated_content}".strip()
+            
             return {
                 'title': title_text,
-                'main_content': main_content[:5000],
+                'main_content': truncated_content,
+                'combined_text': combined_text,
+                'tokens': combined_text.split(),
                 'has_main_content': bool(main_content),
                 'word_count': len(main_content.split())
             }
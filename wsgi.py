@@ -0,0 +1,7 @@
+# wsgi.py
+"""
+WSGI entry point for production servers
+
+Run with: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+from app import app